@@ -1,14 +1,41 @@
 import requests
-import pandas as pd
 import argparse
+import asyncio
+import codecs
+import hashlib
 import json
 import logging
 import os
-from dotenv import load_dotenv
-from io import StringIO
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import MappingProxyType
+from lxml import etree, html as lxml_html
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# Muat variabel lingkungan (untuk GOOGLE_API_KEY)
-load_dotenv()
+try:
+    import diskcache
+except ImportError:  # diskcache opsional; tanpa itu cache API hanya bertahan di memori proses
+    diskcache = None
+
+try:
+    # Backend lexbor; backend lama (selectolax.parser / Modest) tidak lagi tersedia di selectolax 1.x
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax opsional; tanpa itu tabel diekstrak dengan lxml
+    LexborHTMLParser = None
+# Agar peringatan "selectolax tidak tersedia" hanya dicatat sekali per proses
+_selectolax_missing_logged = False
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson opsional; json bawaan tetap berfungsi, hanya lebih lambat
+    _json_loads = json.loads
 
 # Konfigurasi logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -44,174 +71,949 @@ LOCATION_DATA = {
     }
 }
 
+# Provinsi dapat dicari dengan nama lengkap maupun kodenya (mis. "texas" atau "tx" -> "TX"),
+# sehingga kode yang dikembalikan AI tidak perlu ditafsirkan ulang
+for _country_data in LOCATION_DATA.values():
+    _provinces = _country_data["provinces"]
+    _country_data["provinces_merged"] = {**_provinces, **{code.lower(): code for code in _provinces.values()}}
+del _country_data, _provinces
+
+def _build_location_index():
+    """Meratakan LOCATION_DATA menjadi tabel lookup (negara, provinsi) -> (api_code, kode provinsi).
+
+    Kunci provinsi None mewakili pencarian "All" di suatu negara. Kedua tabel dibungkus
+    MappingProxyType agar tidak dapat diubah secara tidak sengaja saat runtime.
+    """
+    country_codes = {}
+    flat_locations = {}
+    for country, country_data in LOCATION_DATA.items():
+        api_code = country_data["api_code"]
+        country_codes[country] = api_code
+        flat_locations[(country, None)] = (api_code, None)
+        for province, province_code in country_data["provinces_merged"].items():
+            flat_locations[(country, province)] = (api_code, province_code)
+    return MappingProxyType(country_codes), MappingProxyType(flat_locations)
+
+_COUNTRY_CODE, _FLAT_LOC = _build_location_index()
+
+# Penanda "tidak ada hasil" dari API, dicocokkan dalam satu kali pemindaian
+_NO_RESULTS_RE = re.compile(r"No records found|No results found|\b0 records found", re.I)
+# Ukuran potongan saat membaca body respons secara streaming, dan jumlah karakter akhir
+# potongan sebelumnya yang ikut dipindai agar penanda yang terpotong di batas tetap terdeteksi
+STREAM_CHUNK_SIZE = 8192
+_MARKER_OVERLAP = 32
+
+# Batas ukuran body respons API; respons yang lebih besar ditolak agar memori tidak terpakai tanpa batas
+MAX_RESPONSE_BYTES = 5_000_000
+
+class _ResponseTooLarge(Exception):
+    """Body respons API melebihi MAX_RESPONSE_BYTES."""
+
+class _BodyCollector:
+    """Mengumpulkan potongan body respons sambil memindai penanda "tidak ada hasil"."""
+    def __init__(self, encoding: str = None):
+        self.chunks = []
+        self._tail = ""
+        self._size = 0
+        try:
+            decoder_factory = codecs.getincrementaldecoder(encoding or "utf-8")
+        except LookupError:
+            decoder_factory = codecs.getincrementaldecoder("utf-8")
+        self._decoder = decoder_factory(errors="replace")
+
+    def feed_bytes(self, data: bytes) -> bool:
+        """Mendekode potongan byte lalu meneruskannya ke feed; memunculkan _ResponseTooLarge jika melewati batas."""
+        self._size += len(data)
+        if self._size > MAX_RESPONSE_BYTES:
+            raise _ResponseTooLarge(f"body melebihi {MAX_RESPONSE_BYTES} byte")
+        return self.feed(self._decoder.decode(data))
+
+    def feed(self, chunk: str) -> bool:
+        """Menambahkan potongan; mengembalikan True jika penanda "tidak ada hasil" ditemukan."""
+        # _tail menyimpan satu karakter ekstra di depan overlap; pencarian dimulai setelahnya agar
+        # karakter itu hanya menjadi konteks \b ("10 records found" bukan "0 records found")
+        window = self._tail + chunk
+        if _NO_RESULTS_RE.search(window, max(len(self._tail) - _MARKER_OVERLAP, 0)):
+            return True
+        self.chunks.append(chunk)
+        self._tail = window[-(_MARKER_OVERLAP + 1):]
+        return False
+
+    def text(self) -> str:
+        self.chunks.append(self._decoder.decode(b"", final=True))
+        return "".join(self.chunks)
+
+# Penanda kolom pada baris header tabel hasil, untuk melewati tabel tata letak/navigasi
+_RESULTS_TABLE_RE = re.compile(r"\b(?:Name|Ranch|State|Prov|Province|Country)\b", re.I)
+# Pola lemah yang hanya diperiksa jika respons tidak memiliki tabel sama sekali
+_EMPTY_HINT_RE = re.compile(r"no data|empty|no results|not found", re.I)
+
+# Aturan pemilihan tabel dan bentuk baris dipakai bersama oleh jalur selectolax dan lxml;
+# tiap backend hanya menyediakan fungsi akses node-nya sendiri agar keduanya tidak berbeda perilaku.
+def _select_results_table(tables, first_row, row_text):
+    """Memilih tabel yang baris pertamanya memuat penanda kolom hasil (Name, State, ...).
+
+    first_row(table) mengembalikan baris pertama atau None, row_text(row) teks barisnya dengan
+    sel digabung spasi. Jika tidak ada yang cocok, tabel pertama dipakai; None jika tidak ada tabel.
+    """
+    for table in tables:
+        row = first_row(table)
+        if row is not None and _RESULTS_TABLE_RE.search(row_text(row)):
+            return table
+    return tables[0] if tables else None
+
+def _rows_from_cells(rows, header_cells, data_cells, cell_text):
+    """Menyusun header dan baris data dari baris tabel.
+
+    Baris tanpa sel <td> dilewati. Mengembalikan None jika tidak ada baris atau jumlah sel
+    suatu baris berbeda dari header (mis. colspan), agar pemanggil dapat memakai jalur cadangan.
+    """
+    if not rows:
+        return None
+    header = [cell_text(cell).strip() for cell in header_cells(rows[0])]
+    data = []
+    for row in rows[1:]:
+        cells = data_cells(row)
+        if not cells:
+            continue
+        if len(cells) != len(header):
+            return None
+        data.append([cell_text(cell).strip() for cell in cells])
+    return header, data
+
+# Cache hasil interpretasi perintah: SHA1(perintah ternormalisasi) -> hasil parsing AI
+COMMAND_CACHE_FILE = Path.home() / ".mrscraper_cache.json"
+# Batas jumlah entri; entri tertua dibuang lebih dulu agar file tidak tumbuh tanpa batas
+COMMAND_CACHE_MAX_ENTRIES = 1000
+_command_cache = None
+
+def _command_cache_key(user_command: str) -> str:
+    """Menormalisasi perintah (huruf kecil, spasi dirapikan) dan mengembalikan hash SHA1-nya."""
+    normalized = " ".join(user_command.strip().lower().split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+def _load_command_cache() -> dict:
+    """Memuat cache perintah dari disk sekali per proses."""
+    global _command_cache
+    if _command_cache is None:
+        _command_cache = {}
+        try:
+            with open(COMMAND_CACHE_FILE, encoding="utf-8") as f:
+                loaded = json.load(f)
+            if isinstance(loaded, dict):
+                _command_cache = loaded
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logging.warning(f"⚠️ Gagal membaca cache perintah {COMMAND_CACHE_FILE}: {e}")
+    return _command_cache
+
+def _store_command_cache(key: str, parsed_query: dict):
+    """Menyimpan hasil parsing ke cache di memori dan menuliskannya ke disk.
+
+    File ditulis ke berkas sementara lalu dipindahkan dengan os.replace, sehingga crash atau
+    proses CLI lain yang berjalan bersamaan tidak pernah meninggalkan file yang terpotong.
+    """
+    cache = _load_command_cache()
+    cache.pop(key, None)
+    cache[key] = parsed_query
+    while len(cache) > COMMAND_CACHE_MAX_ENTRIES:
+        del cache[next(iter(cache))]
+    cache_dir = os.path.dirname(os.path.abspath(COMMAND_CACHE_FILE))
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=cache_dir, prefix=".mrscraper_cache.",
+                                         suffix=".tmp", delete=False) as f:
+            tmp_path = f.name
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, COMMAND_CACHE_FILE)
+    except OSError as e:
+        logging.warning(f"⚠️ Gagal menyimpan cache perintah {COMMAND_CACHE_FILE}: {e}")
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+# Ambang kemiripan kosinus agar perintah yang mirip secara semantik dianggap sama
+SEMANTIC_CACHE_THRESHOLD = 0.95
+EMBEDDING_MODEL = "models/text-embedding-004"
+COUNTRY_ALIASES = {"united states": ["us", "usa", "u.s.", "u.s.a.", "america"]}
+
+def _mentions(text: str, phrase: str, ignore_case: bool = True) -> bool:
+    """Memeriksa apakah frasa muncul sebagai kata utuh di dalam teks."""
+    flags = re.I if ignore_case else 0
+    return re.search(r"(?<!\w)" + re.escape(phrase) + r"(?!\w)", text, flags) is not None
+
+def _query_matches_command(parsed_query: dict, user_command: str) -> bool:
+    """Memastikan hasil cache semantik sesuai dengan perintah baru, ke dua arah.
+
+    Embedding untuk "ranches in Texas" dan "ranches in Kansas" bisa sangat mirip, jadi hit
+    semantik hanya dipakai jika lokasi dan nama pada hasil cache muncul di perintah, dan
+    perintah tidak menambahkan lokasi atau nama yang tidak ada di hasil cache.
+    """
+    country = (parsed_query.get("country") or "").lower()
+    province = (parsed_query.get("province") or "").lower()
+    name = parsed_query.get("name")
+    # AI bisa mengembalikan kode ("tx"); bandingkan dengan nama lengkap provinsi
+    province_name = _PROVINCE_BY_CODE.get(province.upper(), province) or None
+
+    # Arah 1: semua entitas hasil cache disebut di perintah
+    if name and name.lower() not in user_command.lower():
+        return False
+    if province:
+        code = LOCATION_DATA.get(country, {}).get("provinces_merged", {}).get(province)
+        if not (_mentions(user_command, province_name) or (code is not None and _mentions(user_command, code, ignore_case=False))):
+            return False
+    elif country:
+        if not any(_mentions(user_command, alias) for alias in [country] + COUNTRY_ALIASES.get(country, [])):
+            return False
+
+    # Arah 2: perintah tidak menyebut lokasi atau nama yang hilang dari hasil cache
+    guess, _ = _guess_query(user_command)
+    if guess is None:
+        # Lokasi ambigu atau tidak ada lokasi sama sekali: hanya aman jika hasil cache juga tanpa lokasi
+        return not (country or province) and bool(name)
+    if guess["province"] != province_name or guess["country"] != (country or None):
+        return False
+    # Nama harus sama persis: "sullivan farms" tidak boleh dipakai untuk "sullivan farms inc"
+    if guess["name"] and (not name or guess["name"].lower() != name.lower()):
+        return False
+    return True
+
+def _alternation(phrases) -> str:
+    """Menyusun alternasi regex kata utuh; frasa terpanjang didahulukan agar "new york" menang atas "york"."""
+    escaped = [re.escape(phrase) for phrase in sorted(phrases, key=len, reverse=True)]
+    return r"(?<!\w)(?:" + "|".join(escaped) + r")(?!\w)"
+
+# Jalur cepat tanpa LLM: nama negara/provinsi dikenali langsung dari perintah.
+# "us" huruf kecil adalah kata ganti biasa, jadi hanya "US" huruf besar yang dianggap negara.
+_COUNTRY_NAMES = {alias: country for country, aliases in COUNTRY_ALIASES.items() for alias in aliases if alias != "us"}
+_COUNTRY_NAMES.update({country: country for country in LOCATION_DATA})
+_COUNTRY_RE = re.compile(_alternation(_COUNTRY_NAMES) + r"|(?-i:(?<!\w)US(?!\w))", re.I)
+_PROVINCE_COUNTRY = {province: country for country, country_data in LOCATION_DATA.items() for province in country_data["provinces"]}
+_PROVINCE_RE = re.compile(_alternation(_PROVINCE_COUNTRY), re.I)
+# Kode provinsi hanya dikenali dalam huruf besar ("TX") dan hanya setelah "in", "from", "of" atau koma,
+# karena "IN", "OR", "ME", "OK" juga kata biasa (mis. "ALL RANCHES IN US" bukan Indiana)
+_PROVINCE_BY_CODE = {code: province for country_data in LOCATION_DATA.values() for province, code in country_data["provinces"].items()}
+_PROVINCE_CODE_RE = re.compile(r"(?i:(?<!\w)(?:in|from|of)\s+|,\s*)(" + _alternation(_PROVINCE_BY_CODE) + ")")
+# Kata pengisi yang boleh tersisa setelah lokasi dihapus; kata lain dianggap bisa jadi nama peternakan
+_FILLER_WORDS = frozenset("""
+    a all an any anything are at based breeder breeders can cattle country entire every everything farm farms
+    find for from get give i in is list located looking me of please province ranch rancher ranchers ranches
+    search see show state stuff the there to us want what whole you
+""".split())
+_WORD_RE = re.compile(r"\w+")
+
+# Kata pengisi yang biasanya bagian dari nama jika muncul setelah kata lain ("sullivan farms")
+_NAME_SUFFIX_WORDS = frozenset({"farm", "farms"})
+_QUOTED_RE = re.compile(r"['\"]([^'\"]+)['\"]")
+
+def _guess_query(user_command: str):
+    """Menebak hasil parsing perintah dengan regex. Mengembalikan (query, yakin).
+
+    query bernilai None jika lokasinya ambigu: lebih dari satu negara/provinsi, atau negara
+    dan provinsi yang tidak cocok. yakin bernilai True hanya jika tidak ada tanda kutip dan
+    semua kata tersisa adalah kata pengisi; selain itu nama ditebak dari teks dalam tanda
+    kutip, atau dari kata tersisa setelah kata pengisi di awal/akhir dibuang.
+    Tebakan yang tidak yakin hanya dipakai untuk permintaan API spekulatif.
+    """
+    countries = {_COUNTRY_NAMES.get(m.group(0).lower(), "united states") for m in _COUNTRY_RE.finditer(user_command)}
+    provinces = {m.group(0).lower() for m in _PROVINCE_RE.finditer(user_command)}
+    provinces.update(_PROVINCE_BY_CODE[m.group(1)] for m in _PROVINCE_CODE_RE.finditer(user_command))
+    if len(countries) > 1 or len(provinces) > 1 or not (countries or provinces):
+        return None, False
+
+    country = next(iter(countries), None)
+    province = next(iter(provinces), None)
+    if province:
+        if country and country != _PROVINCE_COUNTRY[province]:
+            return None, False
+        country = _PROVINCE_COUNTRY[province]
+
+    quoted = _QUOTED_RE.search(user_command)
+    if quoted:
+        return {"country": country, "province": province, "name": quoted.group(1).strip()}, False
+
+    remainder = _COUNTRY_RE.sub(" ", user_command)
+    words = _WORD_RE.findall(_PROVINCE_CODE_RE.sub(" ", _PROVINCE_RE.sub(" ", remainder)))
+    while words and words[0].lower() in _FILLER_WORDS:
+        words.pop(0)
+    while words and words[-1].lower() in _FILLER_WORDS - _NAME_SUFFIX_WORDS:
+        words.pop()
+    confident = not words and "'" not in user_command and '"' not in user_command
+    return {"country": country, "province": province, "name": " ".join(words) or None}, confident
+
+def _fast_parse(user_command: str):
+    """Mem-parsing perintah lokasi sederhana dengan regex, tanpa memanggil LLM.
+
+    Mengembalikan None jika perintah ambigu: lebih dari satu negara/provinsi, negara dan
+    provinsi yang tidak cocok, tanda kutip, atau kata tersisa yang mungkin merupakan nama.
+    """
+    query, confident = _guess_query(user_command)
+    return query if confident else None
+
+# Prompt ini dirancang ulang sepenuhnya untuk tugas baru kita: mem-parsing query, bukan membuat aksi Selenium.
+# Bagian statisnya (termasuk daftar lokasi) disusun sekali saat import; perintah pengguna ditambahkan di akhir.
+_PROMPT_PREFIX = """
+        You are a query parser for a cattle ranch directory. Your task is to extract structured information from a user's natural language command.
+        The available locations are: """ + json.dumps(list(LOCATION_DATA.keys())) + """ and their respective provinces/states.
+
+        Your goal is to return a SINGLE JSON object with three keys: "country", "province", and "name".
+        - "country" and "province" must be lowercase.
+        - If a piece of information is not mentioned, its value must be `null`.
+        - If the user says "all" for a country (e.g., "all of Canada"), set province to `null`.
+
+        Examples:
+        - User: "Find ranches in Alberta, Canada" -> {"country": "canada", "province": "alberta", "name": null}
+        - User: "Show me all breeders in the US" -> {"country": "united states", "province": null, "name": null}
+        - User: "Search for 'Circle M' in Texas" -> {"country": "united states", "province": "texas", "name": "Circle M"}
+        - User: "Any ranches in Argentina?" -> {"country": "argentina", "province": null, "name": null}
+        - User: "sullivan farms in kansas" -> {"country": "united states", "province": "kansas", "name": "sullivan farms"}
+
+        Now, parse the following user command. Return only the JSON object.
+
+        User Command: """ + '"'
+
+# Skema keluaran Gemini; dengan response_mime_type JSON, model dibatasi di sisi server ke bentuk ini
+QUERY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "country": {"type": "string", "nullable": True},
+        "province": {"type": "string", "nullable": True},
+        "name": {"type": "string", "nullable": True},
+    },
+    "required": ["country", "province", "name"],
+}
+
+# Thread untuk menghitung embedding cache semantik selagi menunggu Gemini
+_EMBEDDING_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
 class AIProcessor:
     """Menggunakan LLM untuk mengubah bahasa alami menjadi parameter pencarian terstruktur."""
     def __init__(self, api_key: str = None):
+        # Muat variabel lingkungan (untuk GOOGLE_API_KEY); diimpor di sini agar import modul tetap ringan
+        from dotenv import load_dotenv
+        load_dotenv()
+
         self.api_key = api_key or os.getenv('GOOGLE_API_KEY')
         self.model = None
+        self.genai = None
+        # Cache semantik di memori: matriks embedding ternormalisasi dan hasil parsing yang sejajar
+        self._semantic_embeddings = None
+        self._semantic_results = []
         if self.api_key:
             try:
                 import google.generativeai as genai
                 genai.configure(api_key=self.api_key)
-                self.model = genai.GenerativeModel('gemini-1.5-flash')
+                self.genai = genai
+                self.model = genai.GenerativeModel(
+                    'gemini-1.5-flash',
+                    generation_config={"response_mime_type": "application/json", "response_schema": QUERY_SCHEMA},
+                )
                 logging.info("✅ Google AI (Gemini) berhasil diinisialisasi.")
             except Exception as e:
                 logging.error(f"❌ Gagal menginisialisasi Google AI: {e}")
         else:
             logging.warning("⚠️ GOOGLE_API_KEY tidak ditemukan. Fitur AI tidak akan berfungsi.")
 
+    def _embed(self, text: str):
+        """Menghasilkan embedding ternormalisasi untuk teks, atau None jika gagal."""
+        import numpy as np
+        try:
+            result = self.genai.embed_content(model=EMBEDDING_MODEL, content=text)
+            vector = np.asarray(result["embedding"], dtype=np.float32)
+        except Exception as e:
+            logging.warning(f"⚠️ Gagal membuat embedding, cache semantik dilewati: {e}")
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _semantic_lookup(self, embedding, user_command: str):
+        """Mencari hasil parsing dari perintah sebelumnya yang paling mirip secara semantik.
+
+        Hit semantik tidak ditulis ke cache persis di disk, agar hasil yang keliru tidak menetap selamanya.
+        """
+        if embedding is None or self._semantic_embeddings is None:
+            return None
+        import numpy as np
+        scores = self._semantic_embeddings @ embedding
+        best = int(np.argmax(scores))
+        if scores[best] < SEMANTIC_CACHE_THRESHOLD:
+            return None
+        candidate = self._semantic_results[best]
+        if not _query_matches_command(candidate, user_command):
+            return None
+        logging.info(f"♻️ Menggunakan hasil parsing dari cache semantik (kemiripan {scores[best]:.3f}).")
+        return dict(candidate)
+
+    def _semantic_store(self, embedding, parsed_query: dict):
+        """Menambahkan embedding dan hasil parsing ke cache semantik."""
+        if embedding is None:
+            return
+        import numpy as np
+        if self._semantic_embeddings is None:
+            self._semantic_embeddings = embedding[np.newaxis, :]
+        else:
+            self._semantic_embeddings = np.vstack([self._semantic_embeddings, embedding])
+        self._semantic_results.append(dict(parsed_query))
+
+    @staticmethod
+    def _build_prompt(user_command: str) -> str:
+        """Menyusun prompt Gemini untuk satu perintah pengguna; hanya perintahnya yang berubah per panggilan."""
+        return _PROMPT_PREFIX + user_command + '"\n'
+
+    def will_call_model(self, user_command: str) -> bool:
+        """True jika interpret_command akan memanggil model (bukan jalur cepat atau cache persis)."""
+        if self.model is None or _fast_parse(user_command) is not None:
+            return False
+        return _command_cache_key(user_command) not in _load_command_cache()
+
+    @staticmethod
+    def _try_fast_parse(user_command: str):
+        """Mencoba jalur cepat regex sebelum cache dan LLM."""
+        fast_query = _fast_parse(user_command)
+        if fast_query is not None:
+            logging.info("⚡ Perintah diparsing dengan jalur cepat (regex), tanpa memanggil AI.")
+        return fast_query
+
+    @staticmethod
+    def _exact_lookup(cache_key: str):
+        """Mengambil hasil parsing dari cache perintah yang identik."""
+        cached = _load_command_cache().get(cache_key)
+        if cached is None:
+            return None
+        logging.info("♻️ Menggunakan hasil parsing dari cache.")
+        return dict(cached)
+
+    def _remember(self, cache_key: str, embedding, parsed_query):
+        """Menyimpan hasil parsing yang valid ke cache persis dan cache semantik."""
+        if isinstance(parsed_query, dict) and "error" not in parsed_query:
+            _store_command_cache(cache_key, parsed_query)
+            self._semantic_store(embedding, parsed_query)
+
     def interpret_command(self, user_command: str) -> dict:
         """Mengonversi perintah pengguna menjadi objek JSON terstruktur."""
+        fast_query = self._try_fast_parse(user_command)
+        if fast_query is not None:
+            return fast_query
+
+        cache_key = _command_cache_key(user_command)
+        cached = self._exact_lookup(cache_key)
+        if cached is not None:
+            return cached
+
         if not self.model:
             return {"error": "AI model not available."}
 
-        # Prompt ini dirancang ulang sepenuhnya untuk tugas baru kita: mem-parsing query, bukan membuat aksi Selenium.
-        prompt = f"""
-        You are a query parser for a cattle ranch directory. Your task is to extract structured information from a user's natural language command.
-        The available locations are: {json.dumps(list(LOCATION_DATA.keys()))} and their respective provinces/states.
+        embedding, pending_embedding = None, None
+        if self._semantic_embeddings is not None:
+            embedding = self._embed(user_command)
+            cached = self._semantic_lookup(embedding, user_command)
+            if cached is not None:
+                return cached
+        else:
+            # Cache semantik masih kosong (selalu begitu pada CLI satu perintah): tidak ada yang bisa
+            # dicocokkan, jadi embedding dihitung paralel dengan generate_content, bukan sebelumnya
+            pending_embedding = _EMBEDDING_EXECUTOR.submit(self._embed, user_command)
 
-        Your goal is to return a SINGLE JSON object with three keys: "country", "province", and "name".
-        - "country" and "province" must be lowercase.
-        - If a piece of information is not mentioned, its value must be `null`.
-        - If the user says "all" for a country (e.g., "all of Canada"), set province to `null`.
+        try:
+            response = self.model.generate_content(self._build_prompt(user_command))
+            parsed_query = _json_loads(response.text)
+        except Exception as e:
+            logging.error(f"❌ Gagal memproses perintah AI: {e}")
+            if pending_embedding is not None:
+                pending_embedding.cancel()
+            return {"error": f"Failed to parse AI response: {e}"}
 
-        Examples:
-        - User: "Find ranches in Alberta, Canada" -> {{"country": "canada", "province": "alberta", "name": null}}
-        - User: "Show me all breeders in the US" -> {{"country": "united states", "province": null, "name": null}}
-        - User: "Search for 'Circle M' in Texas" -> {{"country": "united states", "province": "texas", "name": "Circle M"}}
-        - User: "Any ranches in Argentina?" -> {{"country": "argentina", "province": null, "name": null}}
-        - User: "sullivan farms in kansas" -> {{"country": "united states", "province": "kansas", "name": "sullivan farms"}}
+        if pending_embedding is not None:
+            embedding = pending_embedding.result()
+        self._remember(cache_key, embedding, parsed_query)
+        return parsed_query
 
-        Now, parse the following user command. Return only the JSON object.
+    async def interpret_command_async(self, user_command: str) -> dict:
+        """Versi asinkron dari interpret_command untuk pencarian paralel."""
+        fast_query = self._try_fast_parse(user_command)
+        if fast_query is not None:
+            return fast_query
+
+        cache_key = _command_cache_key(user_command)
+        cached = self._exact_lookup(cache_key)
+        if cached is not None:
+            return cached
+
+        if not self.model:
+            return {"error": "AI model not available."}
+
+        loop = asyncio.get_running_loop()
+        embedding, pending_embedding = None, None
+        if self._semantic_embeddings is not None:
+            embedding = await loop.run_in_executor(_EMBEDDING_EXECUTOR, self._embed, user_command)
+            cached = self._semantic_lookup(embedding, user_command)
+            if cached is not None:
+                return cached
+        else:
+            pending_embedding = loop.run_in_executor(_EMBEDDING_EXECUTOR, self._embed, user_command)
 
-        User Command: "{user_command}"
-        """
         try:
-            response = self.model.generate_content(prompt)
-            cleaned_response = response.text.strip().replace("```json", "").replace("```", "")
-            return json.loads(cleaned_response)
+            response = await self.model.generate_content_async(self._build_prompt(user_command))
+            parsed_query = _json_loads(response.text)
         except Exception as e:
             logging.error(f"❌ Gagal memproses perintah AI: {e}")
+            if pending_embedding is not None:
+                pending_embedding.cancel()
             return {"error": f"Failed to parse AI response: {e}"}
 
+        if pending_embedding is not None:
+            embedding = await pending_embedding
+        self._remember(cache_key, embedding, parsed_query)
+        return parsed_query
+
+# Batas waktu (connect, read) dalam detik untuk setiap permintaan API
+API_TIMEOUT = (3, 15)
+# Percobaan ulang untuk status gateway sementara; dipakai oleh Session sinkron dan klien httpx
+API_RETRIES = 3
+API_RETRY_BACKOFF = 0.3
+API_RETRY_STATUSES = (502, 503, 504)
+
+# Cache respons API: daftar peternak jarang berubah, jadi hasil disimpan selama satu hari
+API_CACHE_TTL = 86400
+# Direktori per pengguna (bukan temp bersama): diskcache memuat pickle, jadi pengguna lain tidak boleh menulis ke sini
+API_CACHE_DIR = Path.home() / ".cache" / "mrscraper_api"
+
+class _MemoryTTLCache:
+    """Pengganti diskcache.Cache di memori (LRU berbatas dengan masa berlaku) jika diskcache tidak terpasang.
+
+    Aman dipakai bersama thread panggilan spekulatif karena setiap akses dijaga lock.
+    """
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._items[key]
+                return default
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key, value, expire=None):
+        expires_at = time.monotonic() + expire if expire else float("inf")
+        with self._lock:
+            self._items[key] = (expires_at, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def close(self):
+        """Disamakan dengan diskcache.Cache.close(); tidak ada sumber daya yang perlu dilepas."""
+
+def _open_api_cache():
+    """Membuka cache respons API di disk, atau cache memori jika diskcache tidak tersedia."""
+    if diskcache is not None:
+        try:
+            return diskcache.Cache(str(API_CACHE_DIR))
+        except Exception as e:
+            logging.warning(f"⚠️ Gagal membuka cache API di {API_CACHE_DIR}, memakai cache memori: {e}")
+    return _MemoryTTLCache()
+
 class ShorthornApiScraper:
     """Scraper yang menggunakan pemanggilan API langsung dan pemrosesan NLP."""
     def __init__(self):
         self.base_url = "https://shorthorn.digitalbeef.com/modules/DigitalBeef-Landing/ajax/search_results_ranch.php"
         self.ai_processor = AIProcessor()
 
+        # Session dengan keep-alive agar koneksi TCP+TLS dipakai ulang antar pencarian
+        self.session = requests.Session()
+        retries = Retry(total=API_RETRIES, backoff_factor=API_RETRY_BACKOFF, status_forcelist=list(API_RETRY_STATUSES))
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries))
+        self.api_cache = _open_api_cache()
+        # Thread untuk memulai permintaan API secara spekulatif selagi menunggu Gemini
+        self._executor = ThreadPoolExecutor(max_workers=2)
+
+    def close(self):
+        """Menghentikan thread spekulatif, menutup koneksi Session dan cache API; panggil setelah scraper selesai dipakai."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+        self.api_cache.close()
+
     def search(self, command: str) -> dict:
         """Menerima perintah bahasa alami, mem-parsingnya, dan memanggil API."""
         logging.info(f"Menerima perintah: '{command}'")
+        speculative_params, speculative_result = self._start_speculative_call(command)
         parsed_query = self.ai_processor.interpret_command(command)
 
+        params, error = self._build_params(parsed_query)
+        if error:
+            if speculative_result is not None:
+                speculative_result.cancel()
+            return error
+        if speculative_result is not None:
+            if params == speculative_params:
+                logging.info("⚡ Tebakan parameter cocok dengan hasil AI, memakai permintaan API spekulatif.")
+                return speculative_result.result()
+            logging.info("Tebakan parameter berbeda dari hasil AI, permintaan API spekulatif diabaikan.")
+            speculative_result.cancel()
+        return self._call_api(params)
+
+    def _start_speculative_call(self, command: str):
+        """Memulai permintaan API dengan parameter tebakan regex selagi Gemini memproses perintah.
+
+        Hanya dilakukan jika perintah benar-benar akan dikirim ke LLM; perintah yang dapat
+        diparsing dengan yakin oleh jalur cepat atau sudah ada di cache tidak perlu ditebak.
+        Mengembalikan (params, future) atau (None, None).
+        """
+        if not self.ai_processor.will_call_model(command):
+            return None, None
+        guess, _ = _guess_query(command)
+        if guess is None:
+            return None, None
+        params, error = self._params_from_query(guess)
+        if error:
+            return None, None
+        logging.info(f"Memulai permintaan API spekulatif dengan parameter: {params}")
+        return params, self._executor.submit(self._call_api, params)
+
+    async def search_async(self, command: str, client=None) -> dict:
+        """Versi asinkron dari search; `client` adalah httpx.AsyncClient yang dapat dibagi antar pencarian."""
+        logging.info(f"Menerima perintah: '{command}'")
+        parsed_query = await self.ai_processor.interpret_command_async(command)
+
+        params, error = self._build_params(parsed_query)
+        if error:
+            return error
+        if client is None:
+            async with self._async_client() as client:
+                return await self._call_api_async(client, params)
+        return await self._call_api_async(client, params)
+
+    def search_batch(self, commands: list) -> list:
+        """Menjalankan beberapa perintah secara bersamaan dan mengembalikan hasil sesuai urutan input."""
+        return asyncio.run(self._search_batch(commands))
+
+    async def _search_batch(self, commands: list) -> list:
+        """Menjalankan semua pencarian dengan satu httpx.AsyncClient bersama."""
+        async with self._async_client() as client:
+            return await asyncio.gather(*[self.search_async(command, client) for command in commands])
+
+    @staticmethod
+    def _async_client():
+        """Membuat httpx.AsyncClient HTTP/2 dengan batas waktu yang sama seperti Session sinkron.
+
+        HTTP/2 diatur pada transport (flag http2 milik klien diabaikan jika transport diberikan).
+        retries pada transport hanya mengulang kegagalan koneksi; status 502/503/504 diulang
+        di _request_api_async agar perilakunya sama dengan Retry pada Session sinkron.
+        """
+        import httpx
+        connect_timeout, read_timeout = API_TIMEOUT
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            transport=httpx.AsyncHTTPTransport(http2=True, retries=API_RETRIES),
+        )
+
+    def _build_params(self, parsed_query: dict):
+        """Membangun parameter API dari hasil parsing AI. Mengembalikan (params, error)."""
         if not parsed_query or "error" in parsed_query:
-            return {"error": "Gagal menafsirkan perintah.", "details": parsed_query.get("error")}
+            return None, {"error": "Gagal menafsirkan perintah.", "details": (parsed_query or {}).get("error")}
 
         logging.info(f"Perintah berhasil diparsing oleh AI: {parsed_query}")
+        return self._params_from_query(parsed_query)
 
-        # Membangun parameter API dari hasil parsing AI
+    @staticmethod
+    def _params_from_query(parsed_query: dict):
+        """Mengubah query terstruktur {country, province, name} menjadi parameter API. Mengembalikan (params, error)."""
         params = {'l': '', 'v': parsed_query.get('name') or ''}
         country = parsed_query.get('country')
         province = parsed_query.get('province')
 
         if country:
-            country_data = LOCATION_DATA.get(country.lower())
-            if not country_data:
-                return {"error": f"Negara tidak dikenal: {country}"}
-            
-            location_string = country_data['api_code']
-            if province:
-                province_code = country_data['provinces'].get(province.lower())
-                if not province_code:
-                    return {"error": f"Provinsi/Negara Bagian tidak dikenal '{province}' untuk {country}"}
-                location_string += f"|{province_code}"
-            else:
-                location_string += "|" # Untuk pencarian "All" di suatu negara
-            params['l'] = location_string
-        
-        return self._call_api(params)
+            country_key = country.lower()
+            location = _FLAT_LOC.get((country_key, province.lower() if province else None))
+            if location is None:
+                if country_key not in _COUNTRY_CODE:
+                    return None, {"error": f"Negara tidak dikenal: {country}"}
+                return None, {"error": f"Provinsi/Negara Bagian tidak dikenal '{province}' untuk {country}"}
 
-    def _call_api(self, params: dict) -> dict:
-        """Fungsi internal untuk memanggil API dan mem-parsing hasilnya."""
-        logging.info(f"Mengirim permintaan ke API dengan parameter: {params}")
+            api_code, province_code = location
+            # Kode provinsi kosong berarti pencarian "All" di suatu negara
+            params['l'] = f"{api_code}|{province_code or ''}"
+
+        return params, None
+
+    @staticmethod
+    def _rows_with_selectolax(html_content: str):
+        """Mengekstrak header dan baris data dengan selectolax.
+
+        Mengembalikan None jika selectolax tidak terpasang, tidak ada tabel, struktur tabel
+        tidak beraturan, atau parsing gagal, agar pemanggil dapat jatuh kembali ke jalur lxml.
+        """
+        global _selectolax_missing_logged
+        if LexborHTMLParser is None:
+            if not _selectolax_missing_logged:
+                logging.info("ℹ️ selectolax (lexbor) tidak tersedia, tabel diekstrak dengan lxml.")
+                _selectolax_missing_logged = True
+            return None
         try:
-            response = requests.get(self.base_url, params=params)
-            response.raise_for_status()
+            tables = LexborHTMLParser(html_content).css('table')
+            table = _select_results_table(tables, lambda t: t.css_first('tr'), lambda row: row.text(separator=" "))
+            if table is None:
+                return None
+            return _rows_from_cells(
+                table.css('tr'),
+                lambda row: [cell for cell in row.iter() if cell.tag in ('th', 'td')],
+                lambda row: [cell for cell in row.iter() if cell.tag == 'td'],
+                lambda cell: cell.text(),
+            )
+        except Exception as e:
+            logging.debug(f"selectolax gagal mem-parsing tabel, beralih ke lxml: {e}")
+            return None
 
-            html_content = response.text
-            
-            # Check for various "no results" indicators
-            no_results_indicators = [
-                "No records found matching your criteria",
-                "No records found",
-                "No results found",
-                "0 records found"
-            ]
-            
-            if any(indicator in html_content for indicator in no_results_indicators):
-                logging.warning("API tidak mengembalikan data (No records found).")
-                return {"header": [], "data": []}
+    @staticmethod
+    def _find_table(html_content: str):
+        """Mengambil elemen <table> hasil dari respons, atau None jika tidak ada tabel.
 
-            # Fix the FutureWarning by using StringIO
-            df_list = None
-            parse_error = None
-            
-            # Try different HTML parsers
-            parsers = ['html5lib', 'bs4', 'lxml']
-            for parser in parsers:
-                try:
-                    df_list = pd.read_html(StringIO(html_content), flavor=parser)
-                    break
-                except Exception as e:
-                    parse_error = e
-                    continue
-            
-            # If all parsers failed, try without specifying flavor
-            if df_list is None:
-                try:
-                    df_list = pd.read_html(StringIO(html_content))
-                except Exception as e:
-                    parse_error = e
-            
-            # If still no tables found, check if it's really a "no results" case
-            if df_list is None or len(df_list) == 0:
+        Tabel yang baris pertamanya memuat penanda kolom hasil (Name, State, ...) diutamakan;
+        jika tidak ada yang cocok, tabel pertama dipakai seperti sebelumnya.
+        """
+        try:
+            tables = lxml_html.fromstring(html_content).xpath('//table')
+        except (etree.ParserError, ValueError):
+            return None
+        # Sel digabung dengan spasi agar "Name" dan "State" tidak menyatu menjadi "NameState"
+        return _select_results_table(tables, lambda t: t.find('.//tr'), lambda row: " ".join(row.itertext()))
+
+    @staticmethod
+    def _rows_from_table(table):
+        """Mengekstrak header dan baris data langsung dengan lxml, tanpa membuat DataFrame.
+
+        Mengembalikan None jika struktur tabel tidak beraturan (mis. colspan), agar pemanggil
+        dapat jatuh kembali ke pd.read_html.
+        """
+        return _rows_from_cells(
+            table.xpath('.//tr'),
+            lambda row: row.xpath('./th|./td'),
+            lambda row: row.xpath('./td'),
+            lambda cell: cell.text_content(),
+        )
+
+    @staticmethod
+    def _read_html_fallback(table):
+        """Mem-parsing tabel dengan pd.read_html untuk markup yang tidak bisa ditangani _rows_from_table."""
+        # pandas diimpor hanya saat dibutuhkan: import-nya ~300ms dan jalur ini jarang dipakai
+        import pandas as pd
+        from io import StringIO
+
+        table_html = etree.tostring(table, encoding='unicode')
+        parse_error = None
+        # Try different HTML parsers: lxml (C parser) first, html5lib only as last resort for malformed HTML
+        for parser in ['lxml', 'bs4', 'html5lib']:
+            try:
+                # Fix the FutureWarning by using StringIO
+                results_df = pd.read_html(StringIO(table_html), flavor=parser)[0]
+                break
+            except Exception as e:
+                parse_error = e
+        else:
+            raise parse_error
+
+        header = [str(col) for col in results_df.columns]
+        # Satu kali lintasan per baris; str() hanya untuk sel yang belum berupa string
+        data = [
+            [value if isinstance(value, str) else str(value) for value in row]
+            for row in results_df.itertuples(index=False, name=None)
+        ]
+        return header, data
+
+    def _parse_html(self, html_content: str) -> dict:
+        """Mengubah HTML respons API menjadi header dan baris data.
+
+        Penanda "tidak ada hasil" sudah diperiksa saat body dibaca (lihat _read_body).
+        """
+        # Jalur tercepat: selectolax (lexbor); lxml dan pandas hanya sebagai cadangan
+        parsed = self._rows_with_selectolax(html_content)
+        if parsed is None:
+            table = self._find_table(html_content)
+
+            # If no table found, check if it's really a "no results" case
+            if table is None:
                 # Check if the HTML contains typical "empty result" patterns
-                html_lower = html_content.lower()
-                if any(pattern in html_lower for pattern in ['no data', 'empty', 'no results', 'not found']):
+                if _EMPTY_HINT_RE.search(html_content):
                     logging.warning("Tidak ada tabel ditemukan, kemungkinan tidak ada hasil.")
                     return {"header": [], "data": []}
                 else:
                     # If it's not a "no results" case, then it's a real parsing error
+                    logging.error("Gagal mem-parsing HTML. Error: No tables found")
+                    logging.debug(f"HTML content preview: {html_content[:500]}...")
+                    return {"error": "Gagal mem-parsing tabel dari respons API: No tables found"}
+
+            # Ekstraksi langsung dengan lxml; pandas hanya untuk tabel tidak beraturan
+            parsed = self._rows_from_table(table)
+            if parsed is None:
+                try:
+                    parsed = self._read_html_fallback(table)
+                except Exception as parse_error:
                     logging.error(f"Gagal mem-parsing HTML. Error: {parse_error}")
                     logging.debug(f"HTML content preview: {html_content[:500]}...")
                     return {"error": f"Gagal mem-parsing tabel dari respons API: {str(parse_error)}"}
-                
-            results_df = df_list[0]
-            logging.info(f"✅ Berhasil mengambil {len(results_df)} baris data dari API.")
-
-            # Get actual column names from the DataFrame
-            header = [str(col) for col in results_df.columns]
-            data = results_df.astype(str).values.tolist()
-            
-            # Debug: Print actual headers for troubleshooting
-            logging.info(f"🔍 Header yang ditemukan: {header}")
-            
-            return {"header": header, "data": data}
 
+        header, data = parsed
+        logging.info(f"✅ Berhasil mengambil {len(data)} baris data dari API.")
+
+        # Debug: Print actual headers for troubleshooting
+        logging.info(f"🔍 Header yang ditemukan: {header}")
+        
+        return {"header": header, "data": data}
+
+    @staticmethod
+    def _reject_response(status_ok: bool, status_code: int, headers):
+        """Memeriksa status dan Content-Length sebelum body diunduh; mengembalikan dict error atau None."""
+        if not status_ok:
+            return {"error": f"Gagal menghubungi API: HTTP {status_code}"}
+        content_length = headers.get("Content-Length")
+        if content_length and content_length.isdigit() and int(content_length) > MAX_RESPONSE_BYTES:
+            logging.error(f"Respons API terlalu besar ({content_length} byte), unduhan dibatalkan.")
+            return {"error": f"Respons API terlalu besar: {content_length} byte (batas {MAX_RESPONSE_BYTES})"}
+        return None
+
+    @staticmethod
+    def _read_body(response):
+        """Membaca body secara streaming; mengembalikan None begitu penanda "tidak ada hasil" terlihat.
+
+        Memunculkan _ResponseTooLarge jika body melebihi MAX_RESPONSE_BYTES.
+        """
+        collector = _BodyCollector(response.encoding)
+        try:
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                if collector.feed_bytes(chunk):
+                    return None
+        finally:
+            response.close()
+        return collector.text()
+
+    @staticmethod
+    async def _read_body_async(response):
+        """Versi asinkron dari _read_body untuk respons httpx yang di-stream."""
+        collector = _BodyCollector(response.encoding)
+        async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+            if collector.feed_bytes(chunk):
+                return None
+        return collector.text()
+
+    @staticmethod
+    def _api_cache_key(params: dict) -> tuple:
+        return ('api', tuple(sorted(params.items())))
+
+    def _cached_api_result(self, params: dict):
+        """Mengambil hasil API dari cache, atau None jika belum ada/kedaluwarsa."""
+        cached = self.api_cache.get(self._api_cache_key(params))
+        if cached is not None:
+            logging.info(f"♻️ Menggunakan respons API dari cache untuk parameter: {params}")
+        return cached
+
+    def _store_api_result(self, params: dict, result: dict):
+        """Menyimpan hasil API yang berhasil ke cache; error tidak disimpan."""
+        if "error" not in result:
+            self.api_cache.set(self._api_cache_key(params), result, expire=API_CACHE_TTL)
+
+    def _call_api(self, params: dict) -> dict:
+        """Fungsi internal untuk memanggil API (atau cache) dan mem-parsing hasilnya."""
+        cached = self._cached_api_result(params)
+        if cached is not None:
+            return cached
+        result = self._request_api(params)
+        self._store_api_result(params, result)
+        return result
+
+    async def _call_api_async(self, client, params: dict) -> dict:
+        """Versi asinkron dari _call_api."""
+        cached = self._cached_api_result(params)
+        if cached is not None:
+            return cached
+        result = await self._request_api_async(client, params)
+        self._store_api_result(params, result)
+        return result
+
+    def _request_api(self, params: dict) -> dict:
+        """Mengirim permintaan ke API dan mem-parsing hasilnya."""
+        logging.info(f"Mengirim permintaan ke API dengan parameter: {params}")
+        try:
+            response = self.session.get(self.base_url, params=params, timeout=API_TIMEOUT, stream=True)
+            rejection = self._reject_response(response.ok, response.status_code, response.headers)
+            if rejection:
+                response.close()
+                return rejection
+
+            html_content = self._read_body(response)
+            # Check for various "no results" indicators
+            if html_content is None:
+                logging.warning("API tidak mengembalikan data (No records found).")
+                return {"header": [], "data": []}
+
+            return self._parse_html(html_content)
+
+        except _ResponseTooLarge as e:
+            logging.error(f"Unduhan dibatalkan: {e}")
+            return {"error": f"Respons API terlalu besar: {e}"}
         except requests.exceptions.RequestException as e:
             return {"error": f"Gagal menghubungi API: {e}"}
         except Exception as e:
-            logging.error(f"Unexpected error dalam _call_api: {e}")
+            logging.error(f"Unexpected error dalam _request_api: {e}")
+            return {"error": f"Error tidak terduga: {str(e)}"}
+
+    async def _request_api_async(self, client, params: dict) -> dict:
+        """Versi asinkron dari _request_api; parsing HTML dijalankan di thread pool agar event loop tidak terblokir."""
+        import httpx
+        logging.info(f"Mengirim permintaan ke API dengan parameter: {params}")
+        try:
+            for attempt in range(API_RETRIES + 1):
+                async with client.stream("GET", self.base_url, params=params) as response:
+                    if response.status_code in API_RETRY_STATUSES and attempt < API_RETRIES:
+                        logging.warning(f"API mengembalikan HTTP {response.status_code}, mencoba ulang ({attempt + 1}/{API_RETRIES}).")
+                        await asyncio.sleep(API_RETRY_BACKOFF * (2 ** attempt))
+                        continue
+                    rejection = self._reject_response(response.is_success, response.status_code, response.headers)
+                    if rejection:
+                        return rejection
+                    html_content = await self._read_body_async(response)
+                break
+
+            # Check for various "no results" indicators
+            if html_content is None:
+                logging.warning("API tidak mengembalikan data (No records found).")
+                return {"header": [], "data": []}
+
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._parse_html, html_content)
+
+        except _ResponseTooLarge as e:
+            logging.error(f"Unduhan dibatalkan: {e}")
+            return {"error": f"Respons API terlalu besar: {e}"}
+        except httpx.HTTPError as e:
+            return {"error": f"Gagal menghubungi API: {e}"}
+        except Exception as e:
+            logging.error(f"Unexpected error dalam _request_api_async: {e}")
             return {"error": f"Error tidak terduga: {str(e)}"}
 
 def main():
     parser = argparse.ArgumentParser(description="Scraper Cerdas berbasis API untuk Shorthorn Digital Beef.")
-    parser.add_argument("-c", "--command", required=True, type=str, help="Perintah pencarian dalam bahasa alami.")
+    parser.add_argument("-c", "--command", required=True, type=str, action="append",
+                        help="Perintah pencarian dalam bahasa alami. Ulangi -c untuk menjalankan beberapa pencarian sekaligus.")
     args = parser.parse_args()
 
     scraper = ShorthornApiScraper()
-    results = scraper.search(args.command)
+    try:
+        if len(args.command) == 1:
+            results = scraper.search(args.command[0])
+        else:
+            results = scraper.search_batch(args.command)
+    finally:
+        scraper.close()
 
     print("\n--- Hasil Scraping Cerdas dari API ---")
     print(json.dumps(results, indent=2, ensure_ascii=False))
@@ -80,6 +80,13 @@ def run_test_installation():
             print("⚠️  Google AI module not available (install with: pip install google-generativeai)")
         
         # Test HTML parsing dependencies
+        try:
+            import lxml
+            print("✅ lxml parser available")
+        except ImportError:
+            print("❌ lxml not available (primary HTML parser missing)")
+            return False
+        
         try:
             import html5lib
             print("✅ html5lib parser available")
@@ -1,6 +1,13 @@
 import unittest
+import json
 import os
-from intelligent_scraper import ShorthornApiScraper # Impor kelas scraper Anda
+import tempfile
+import threading
+from pathlib import Path
+from unittest import mock
+from lxml import html as lxml_html
+import intelligent_scraper
+from intelligent_scraper import MAX_RESPONSE_BYTES, AIProcessor, ShorthornApiScraper, _command_cache_key, _BodyCollector, _MemoryTTLCache, _ResponseTooLarge, _fast_parse, _query_matches_command # Impor kelas scraper Anda
 
 class TestIntelligentApiScraper(unittest.TestCase):
     """
@@ -15,6 +22,10 @@ class TestIntelligentApiScraper(unittest.TestCase):
         self.assertIsNotNone(self.scraper.ai_processor.model, "GOOGLE_API_KEY harus diatur di file .env untuk menjalankan tes.")
         print(f"\n--- Memulai Pengujian: {self.id()} ---")
 
+    def tearDown(self):
+        """Metode ini dijalankan setelah setiap tes."""
+        self.scraper.close()
+
     def _find_column_index(self, header, possible_names):
         """Helper method to find column index by checking multiple possible names."""
         for name in possible_names:
@@ -225,5 +236,270 @@ class TestIntelligentApiScraper(unittest.TestCase):
         
         print("✅ Tes Perintah Informal Lolos")
 
+    def test_7_concurrent_batch_search(self):
+        """
+        Kasus Uji 7: Beberapa perintah dijalankan bersamaan melalui search_batch.
+        Memvalidasi bahwa hasil dikembalikan sesuai urutan perintah dan setara dengan pencarian tunggal.
+        """
+        commands = ["Find all ranches in Texas", "argentina any?"]
+        results = self.scraper.search_batch(commands)
+
+        self.assertEqual(len(results), len(commands), "Jumlah hasil harus sama dengan jumlah perintah.")
+        for command, result in zip(commands, results):
+            self.assertNotIn("error", result, f"API mengembalikan error untuk '{command}': {result.get('error')}")
+            self.assertGreater(len(result["data"]), 0, f"Seharusnya menemukan peternak untuk '{command}'.")
+            print(f"📊 '{command}': {len(result['data'])} baris")
+
+        print("✅ Tes Pencarian Batch Lolos")
+
+class TestOfflineParsing(unittest.TestCase):
+    """
+    Pengujian offline: memvalidasi parsing HTML dan logika lokal tanpa API Shorthorn maupun GOOGLE_API_KEY.
+    """
+
+    def _make_scraper(self):
+        """Membuat scraper dengan cache API di memori agar tes tidak membuat ~/.cache/mrscraper_api."""
+        with mock.patch.object(intelligent_scraper, "_open_api_cache", _MemoryTTLCache):
+            scraper = ShorthornApiScraper()
+        self.addCleanup(scraper.close)
+        return scraper
+
+    def test_rows_from_regular_table(self):
+        """Tabel beraturan diekstrak langsung dengan lxml, termasuk teks di dalam elemen bersarang."""
+        table = lxml_html.fromstring(
+            "<table><tr><th>Name</th><th>State</th></tr>"
+            "<tr><td>Circle <b>M</b></td><td> TX </td></tr></table>"
+        )
+        header, data = ShorthornApiScraper._rows_from_table(table)
+        self.assertEqual(header, ["Name", "State"])
+        self.assertEqual(data, [["Circle M", "TX"]])
+
+    def test_colspan_table_falls_back_to_pandas(self):
+        """Tabel tidak beraturan (colspan) tidak ditangani lxml langsung, tetapi tetap terbaca lewat pd.read_html."""
+        html = (
+            "<table><tr><th>Name</th><th>State</th></tr>"
+            "<tr><td colspan='2'>Ranch Group</td></tr>"
+            "<tr><td>Sullivan Farms</td><td>KS</td></tr></table>"
+        )
+        self.assertIsNone(ShorthornApiScraper._rows_from_table(lxml_html.fromstring(html)))
+
+        result = ShorthornApiScraper._read_html_fallback(lxml_html.fromstring(html))
+        self.assertEqual(result[0], ["Name", "State"])
+        self.assertIn(["Sullivan Farms", "KS"], result[1])
+
+    LAYOUT_THEN_RESULTS_HTML = (
+        "<html><body><table><tr><td>Home</td><td>Search</td></tr></table>"
+        "<table><tr><th>Name</th><th>City</th><th>State</th></tr>"
+        "<tr><td>Circle M Ranch</td><td>Austin</td><td>TX</td></tr></table></body></html>"
+    )
+
+    def test_results_table_selected_after_layout_table(self):
+        """Tabel tata letak di awal dokumen dilewati; tabel dengan header Name/State yang dipilih."""
+        table = ShorthornApiScraper._find_table(self.LAYOUT_THEN_RESULTS_HTML)
+        self.assertEqual(table.xpath('.//th')[0].text_content(), "Name")
+
+        result = self._make_scraper()._parse_html(self.LAYOUT_THEN_RESULTS_HTML)
+        self.assertEqual(result["header"], ["Name", "City", "State"])
+        self.assertEqual(result["data"], [["Circle M Ranch", "Austin", "TX"]])
+
+    @unittest.skipIf(intelligent_scraper.LexborHTMLParser is None, "selectolax (lexbor) tidak terpasang")
+    def test_selectolax_rows_skip_layout_table(self):
+        """Jalur selectolax (lexbor) memilih tabel hasil yang sama dengan jalur lxml."""
+        header, data = ShorthornApiScraper._rows_with_selectolax(self.LAYOUT_THEN_RESULTS_HTML)
+        self.assertEqual(header, ["Name", "City", "State"])
+        self.assertEqual(data, [["Circle M Ranch", "Austin", "TX"]])
+
+        # Aturan bentuk baris sama dengan lxml: colspan membuat kedua jalur menyerah ke pd.read_html
+        colspan_html = (
+            "<table><tr><th>Name</th><th>State</th></tr>"
+            "<tr><td colspan='2'>Ranch Group</td></tr></table>"
+        )
+        self.assertIsNone(ShorthornApiScraper._rows_with_selectolax(colspan_html))
+        self.assertIsNone(ShorthornApiScraper._rows_from_table(ShorthornApiScraper._find_table(colspan_html)))
+
+    def test_no_results_marker_split_across_chunks(self):
+        """Penanda "No records found" yang terpotong di batas potongan stream tetap terdeteksi."""
+        collector = _BodyCollector()
+        self.assertFalse(collector.feed("<div>" + "x" * 100 + "No rec"))
+        self.assertTrue(collector.feed("ords found matching your criteria</div>"))
+
+        # Overlap yang dimulai tepat di "0" dari "10 records found" tidak boleh terbaca sebagai "0 records found"
+        page = "<p>Showing 10 records found in Texas, see table below</p><table><tr><th>Name</th></tr></table>"
+        split = page.index("0 records") + 32
+        collector = _BodyCollector()
+        self.assertFalse(collector.feed(page[:split]))
+        self.assertFalse(collector.feed(page[split:]))
+        self.assertEqual(collector.text(), page)
+
+        collector = _BodyCollector()
+        self.assertFalse(collector.feed("No rec"))
+        self.assertTrue(collector.feed("ords found"))
+
+        collector = _BodyCollector()
+        self.assertFalse(collector.feed("<table><tr><th>Name</th></tr>"))
+        self.assertFalse(collector.feed("<tr><td>A</td></tr></table>"))
+        self.assertEqual(collector.text(), "<table><tr><th>Name</th></tr><tr><td>A</td></tr></table>")
+
+    def test_response_size_cap(self):
+        """Respons di atas MAX_RESPONSE_BYTES ditolak lewat Content-Length, atau dihentikan saat streaming tanpa header itu."""
+        too_large = {"Content-Length": str(MAX_RESPONSE_BYTES + 1)}
+        self.assertIn("error", ShorthornApiScraper._reject_response(True, 200, too_large))
+        self.assertIsNone(ShorthornApiScraper._reject_response(True, 200, {"Content-Length": "1024"}))
+        self.assertIsNone(ShorthornApiScraper._reject_response(True, 200, {}))
+
+        collector = _BodyCollector("utf-8")
+        self.assertFalse(collector.feed_bytes(b"x" * MAX_RESPONSE_BYTES))
+        with self.assertRaises(_ResponseTooLarge):
+            collector.feed_bytes(b"x")
+
+    def test_memory_cache_expiry_and_lru(self):
+        """Cache memori membuang entri yang kedaluwarsa dan entri yang paling lama tidak dipakai."""
+        now = [1000.0]
+        with mock.patch("intelligent_scraper.time.monotonic", lambda: now[0]):
+            cache = _MemoryTTLCache(maxsize=2)
+            cache.set("a", 1, expire=10)
+            cache.set("b", 2)
+            self.assertEqual(cache.get("a"), 1)
+            now[0] += 11
+            self.assertIsNone(cache.get("a"))
+            self.assertEqual(cache.get("b"), 2)
+
+            cache.set("c", 3)
+            cache.get("b")
+            cache.set("d", 4)
+            self.assertIsNone(cache.get("c"))
+            self.assertEqual((cache.get("b"), cache.get("d")), (2, 4))
+
+    def test_api_errors_are_not_cached(self):
+        """Hanya respons API yang berhasil disimpan; error dicoba ulang pada pemanggilan berikutnya."""
+        scraper = self._make_scraper()
+        params = {'l': 'United States|TX', 'v': ''}
+        ok = {"header": ["Name"], "data": [["Circle M"]]}
+        with mock.patch.object(scraper, "_request_api", side_effect=[{"error": "HTTP 500"}, ok]) as request_api:
+            self.assertEqual(scraper._call_api(params), {"error": "HTTP 500"})
+            self.assertEqual(scraper._call_api(params), ok)
+            self.assertEqual(scraper._call_api(params), ok)
+        self.assertEqual(request_api.call_count, 2)
+
+    def test_command_cache_normalized_key(self):
+        """Perintah yang hanya berbeda huruf besar/spasi memakai entri cache yang sama, dan entri tertua dibuang saat penuh."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_file = Path(tmp_dir) / "cache.json"
+            with mock.patch.object(intelligent_scraper, "COMMAND_CACHE_FILE", cache_file), \
+                 mock.patch.object(intelligent_scraper, "_command_cache", None), \
+                 mock.patch.object(intelligent_scraper, "COMMAND_CACHE_MAX_ENTRIES", 2):
+                query = {"country": "united states", "province": "texas", "name": "X"}
+                intelligent_scraper._store_command_cache(_command_cache_key("Find  X"), query)
+                self.assertEqual(AIProcessor._exact_lookup(_command_cache_key("  find x ")), query)
+                self.assertIsNone(AIProcessor._exact_lookup(_command_cache_key("find y")))
+
+                # Dimuat ulang dari disk seperti proses CLI baru
+                intelligent_scraper._command_cache = None
+                self.assertEqual(AIProcessor._exact_lookup(_command_cache_key("find x")), query)
+
+                intelligent_scraper._store_command_cache(_command_cache_key("find y"), query)
+                intelligent_scraper._store_command_cache(_command_cache_key("find z"), query)
+                intelligent_scraper._command_cache = None
+                self.assertIsNone(AIProcessor._exact_lookup(_command_cache_key("find x")))
+                self.assertEqual(AIProcessor._exact_lookup(_command_cache_key("find z")), query)
+                self.assertEqual([p.name for p in Path(tmp_dir).iterdir()], ["cache.json"])
+
+    def test_semantic_cache_guard_checks_both_directions(self):
+        """Hit cache semantik ditolak jika perintah baru menambah atau mengganti lokasi/nama."""
+        all_us = {"country": "united states", "province": None, "name": None}
+        texas = {"country": "united states", "province": "texas", "name": None}
+
+        self.assertTrue(_query_matches_command(texas, "ranches in TX"))
+        self.assertTrue(_query_matches_command(all_us, "Show me all breeders in the US"))
+
+        self.assertFalse(_query_matches_command(texas, "Find all ranches in Kansas"))
+        self.assertFalse(_query_matches_command(all_us, "any cattle around Texas, US?"))
+        self.assertFalse(_query_matches_command(texas, "Circle M cattle co around Texas"))
+
+        # Nama yang lebih pendek di cache tidak boleh menutupi nama yang lebih panjang di perintah baru
+        sullivan = {"country": "united states", "province": "kansas", "name": "sullivan farms"}
+        smith = {"country": "united states", "province": "texas", "name": "Smith"}
+        self.assertTrue(_query_matches_command(sullivan, "find sullivan farms in kansas"))
+        self.assertFalse(_query_matches_command(sullivan, "Search for 'sullivan farms inc' in Kansas"))
+        self.assertFalse(_query_matches_command(smith, "Smith Brothers ranch in Texas"))
+
+    def test_semantic_cache_with_stub_model(self):
+        """Tanpa isi cache semantik, embedding tidak mendahului Gemini; hit semantik tidak ditulis ke cache disk."""
+        calls = []
+        generated = threading.Event()
+        parsed = {
+            "sullivan farms in kansas": {"country": "united states", "province": "kansas", "name": "sullivan farms"},
+            "Search for 'sullivan farms inc' in Kansas": {"country": "united states", "province": "kansas", "name": "sullivan farms inc"},
+            "Find sullivan farms in kansas": None,
+        }
+
+        class StubModel:
+            def generate_content(self, prompt):
+                command = next(c for c in parsed if prompt.endswith('"' + c + '"\n'))
+                calls.append(("generate", command))
+                generated.set()
+                return mock.Mock(text=json.dumps(parsed[command]))
+
+        class StubGenai:
+            def embed_content(self, model, content):
+                # Jika embedding dihitung sebelum Gemini (bukan paralel), Event ini tidak pernah diset
+                calls.append(("embed", content, generated.wait(timeout=5)))
+                return {"embedding": [1.0, 0.0]}
+
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+             mock.patch.object(intelligent_scraper, "COMMAND_CACHE_FILE", Path(tmp_dir) / "cache.json"), \
+             mock.patch.object(intelligent_scraper, "_command_cache", None):
+            processor = AIProcessor()
+            processor.model, processor.genai = StubModel(), StubGenai()
+
+            self.assertEqual(processor.interpret_command("sullivan farms in kansas"), parsed["sullivan farms in kansas"])
+            self.assertCountEqual(calls, [("generate", "sullivan farms in kansas"), ("embed", "sullivan farms in kansas", True)])
+            self.assertIsNotNone(processor._semantic_embeddings)
+
+            # Embedding identik, tetapi nama lebih panjang: harus ke Gemini, bukan memakai "sullivan farms"
+            result = processor.interpret_command("Search for 'sullivan farms inc' in Kansas")
+            self.assertEqual(result["name"], "sullivan farms inc")
+
+            calls.clear()
+            result = processor.interpret_command("Find sullivan farms in kansas")
+            self.assertEqual(result["name"], "sullivan farms")
+            self.assertEqual(calls, [("embed", "Find sullivan farms in kansas", True)])
+            self.assertNotIn(_command_cache_key("Find sullivan farms in kansas"), intelligent_scraper._load_command_cache())
+
+    def test_params_accept_province_code(self):
+        """Kode provinsi dari AI ("TX") dipetakan sama seperti nama provinsinya; provinsi tak dikenal menghasilkan error."""
+        self.assertEqual(ShorthornApiScraper._params_from_query({"country": "united states", "province": "TX", "name": None}),
+                         ({'l': 'United States|TX', 'v': ''}, None))
+        self.assertEqual(ShorthornApiScraper._params_from_query({"country": "united states", "province": "texas", "name": "Circle M"}),
+                         ({'l': 'United States|TX', 'v': 'Circle M'}, None))
+
+        self.assertEqual(ShorthornApiScraper._params_from_query({"country": "united states", "province": "atlantis", "name": None}),
+                         (None, {"error": "Provinsi/Negara Bagian tidak dikenal 'atlantis' untuk united states"}))
+        self.assertEqual(ShorthornApiScraper._params_from_query({"country": "mars", "province": None, "name": None}),
+                         (None, {"error": "Negara tidak dikenal: mars"}))
+
+    def test_regex_fast_path(self):
+        """Perintah lokasi sederhana diparsing tanpa AI; perintah dengan nama atau lokasi bertentangan diteruskan ke AI."""
+        self.assertEqual(_fast_parse("Find all ranches in Texas"),
+                         {"country": "united states", "province": "texas", "name": None})
+        self.assertEqual(_fast_parse("argentina any?"),
+                         {"country": "argentina", "province": None, "name": None})
+
+        # Perintah yang mengandung nama atau lokasi bertentangan harus jatuh ke LLM
+        self.assertIsNone(_fast_parse("sullivan farms in kansas"))
+        self.assertIsNone(_fast_parse("Search for ranches named 'Creek' in Iowa"))
+        self.assertIsNone(_fast_parse("Find ranches in Alberta, Texas"))
+
+    def test_regex_fast_path_province_codes(self):
+        """Kode provinsi huruf besar hanya dihitung setelah "in"/"from"/"of" atau koma, bukan kata "IN" biasa."""
+        all_us = {"country": "united states", "province": None, "name": None}
+        self.assertEqual(_fast_parse("ALL RANCHES IN US"), all_us)
+        self.assertEqual(_fast_parse("ANY RANCHES IN THE US?"), all_us)
+
+        self.assertEqual(_fast_parse("Find all ranches in TX"),
+                         {"country": "united states", "province": "texas", "name": None})
+        self.assertEqual(_fast_parse("ranches in AB, Canada"),
+                         {"country": "canada", "province": "alberta", "name": None})
+
 if __name__ == '__main__':
     unittest.main(argv=['first-arg-is-ignored'], exit=False)
\ No newline at end of file